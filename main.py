@@ -1,4 +1,5 @@
-from fastapi import FastAPI, HTTPException, Body
+from fastapi import FastAPI, HTTPException, Body, Request, Response
+from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
 from typing import Optional, Dict, Any
 import uvicorn
@@ -11,11 +12,13 @@ try:
     from snmp_utils import fetch_snmp_counters
     from vlan_utils import fetch_vlan_config
     from mcp_bridge import fortinet_client, meraki_client
+    from result_codec import encode_response
 except ImportError:
     sys.path.append(os.path.dirname(__file__))
     from snmp_utils import fetch_snmp_counters
     from vlan_utils import fetch_vlan_config
     from mcp_bridge import fortinet_client, meraki_client
+    from result_codec import encode_response
 
 app = FastAPI(
     title="OSI Troubleshooter API",
@@ -38,35 +41,44 @@ class VlanRequest(BaseModel):
 class ToolCallRequest(BaseModel):
     arguments: Dict[str, Any]
 
+def negotiated(request: Request, payload: Any) -> Response:
+    """Encode payload as JSON or msgpack, gzip/zstd compressed, per the request's Accept headers."""
+    body, media_type, headers = encode_response(
+        jsonable_encoder(payload),
+        request.headers.get("accept"),
+        request.headers.get("accept-encoding"),
+    )
+    return Response(content=body, media_type=media_type, headers=headers)
+
 # Endpoints
 @app.get("/")
 def read_root():
     return {"status": "operational", "message": "OSI Troubleshooter API is running"}
 
 @app.post("/api/snmp/check")
-async def check_snmp(request: SnmpRequest):
+async def check_snmp(request: SnmpRequest, http_request: Request):
     """Fetch SNMP counters."""
     try:
         logging.info(f"Checking SNMP on {request.ip}")
         result = fetch_snmp_counters(request.ip, request.community, request.oid)
-        return {"ip": request.ip, "result": result}
+        return negotiated(http_request, {"ip": request.ip, "result": result})
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/vlan/audit")
-async def audit_vlan(request: VlanRequest):
+async def audit_vlan(request: VlanRequest, http_request: Request):
     """Fetch VLAN config via SSH."""
     try:
         logging.info(f"Auditing VLAN on {request.ip}")
         result = fetch_vlan_config(request.ip, request.username, request.password, request.command)
-        return {"ip": request.ip, "result": result}
+        return negotiated(http_request, {"ip": request.ip, "result": result})
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 # --- MCP Server Proxies ---
 
 @app.get("/api/mcp/{server}/tools")
-async def list_mcp_tools(server: str):
+async def list_mcp_tools(server: str, request: Request):
     """List available tools for a specific MCP server (fortinet or meraki)."""
     if server == "fortinet":
         client = fortinet_client
@@ -75,10 +87,10 @@ async def list_mcp_tools(server: str):
     else:
         raise HTTPException(status_code=404, detail="Server not found")
     
-    return await client.list_tools()
+    return negotiated(request, await client.list_tools())
 
 @app.post("/api/mcp/{server}/call/{tool_name}")
-async def call_mcp_tool(server: str, tool_name: str, payload: ToolCallRequest = Body(...)):
+async def call_mcp_tool(server: str, tool_name: str, request: Request, payload: ToolCallRequest = Body(...)):
     """Call a specific tool on an MCP server."""
     if server == "fortinet":
         client = fortinet_client
@@ -88,7 +100,7 @@ async def call_mcp_tool(server: str, tool_name: str, payload: ToolCallRequest =
         raise HTTPException(status_code=404, detail="Server not found")
         
     result = await client.call_tool(tool_name, payload.arguments)
-    return result
+    return negotiated(request, result)
 
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -17,8 +17,9 @@ urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 class FortiGateAPIDiscovery:
     """Discover and document FortiGate REST API endpoints"""
     
-    def __init__(self, fgt_ip, api_token, port=10443, output_dir="./fortigate_api_docs"):
+    def __init__(self, fgt_ip, api_token, port=10443, output_dir="./fortigate_api_docs", pretty=False):
         self.fgt_ip = fgt_ip
+        self.pretty = pretty
         self.port = port
         self.api_token = api_token
         self.output_dir = Path(output_dir)
@@ -56,7 +57,7 @@ class FortiGateAPIDiscovery:
             
             if response.status_code == 200:
                 schema = response.json()
-                self.save_json("cmdb_full_schema.json", schema)
+                self.save_results("cmdb_full_schema", schema)
                 print(f"[OK] Full CMDB schema saved")
                 return schema
             else:
@@ -74,8 +75,8 @@ class FortiGateAPIDiscovery:
             
             if response.status_code == 200:
                 schema = response.json()
-                safe_name = endpoint_path.replace("/", "_") + "_schema.json"
-                self.save_json(safe_name, schema)
+                safe_name = endpoint_path.replace("/", "_") + "_schema"
+                self.save_results(safe_name, schema)
                 return schema
             else:
                 print(f"[FAIL] Failed to get schema for {endpoint_path}: {response.status_code}")
@@ -92,7 +93,7 @@ class FortiGateAPIDiscovery:
             
             if response.status_code == 200:
                 directory = response.json()
-                self.save_json("monitor_directory.json", directory)
+                self.save_results("monitor_directory", directory)
                 print(f"[OK] Monitor directory saved")
                 return directory
             else:
@@ -178,8 +179,9 @@ class FortiGateAPIDiscovery:
                 }
                 print(f"   [ERROR] {endpoint}: {e}")
         
-        # Save test results
-        self.save_json("endpoint_tests.json", results)
+        # Save test results, one endpoint per line
+        self.save_jsonl("endpoint_tests.jsonl",
+                        ({"endpoint": endpoint, **result} for endpoint, result in results.items()))
         print(f"[OK] Endpoint test results saved")
         return results
     
@@ -265,10 +267,29 @@ class FortiGateAPIClient:
         print(f"[OK] Generated client code saved to {client_file}")
     
     def save_json(self, filename, data):
-        """Save data to JSON file"""
+        """Save data to JSON file (compact unless --pretty was given)"""
         file_path = self.output_dir / filename
-        with open(file_path, 'w') as f:
-            json.dump(data, f, indent=2, default=str)
+        with open(file_path, 'w', encoding='utf-8') as f:
+            if self.pretty:
+                json.dump(data, f, indent=2, ensure_ascii=False, default=str)
+            else:
+                json.dump(data, f, separators=(",", ":"), ensure_ascii=False, default=str)
+    
+    def save_jsonl(self, filename, records):
+        """Save records as line-delimited JSON so large results can be streamed or memory-mapped"""
+        file_path = self.output_dir / filename
+        with open(file_path, 'w', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record, separators=(",", ":"), ensure_ascii=False, default=str))
+                f.write("\n")
+    
+    def save_results(self, basename, data):
+        """Save an API response, writing a results list one record per line with the envelope in <basename>_meta.json"""
+        if isinstance(data, dict) and isinstance(data.get("results"), list):
+            self.save_jsonl(f"{basename}.jsonl", data["results"])
+            self.save_json(f"{basename}_meta.json", {k: v for k, v in data.items() if k != "results"})
+        else:
+            self.save_json(f"{basename}.json", data)
     
     def run_full_discovery(self):
         """Run complete API discovery process"""
@@ -306,10 +327,12 @@ def main():
                        help="FortiGate port (default: 10443)")
     parser.add_argument("-o", "--output", default="./fortigate_api_docs", 
                        help="Output directory (default: ./fortigate_api_docs)")
+    parser.add_argument("--pretty", action="store_true",
+                       help="Indent the single-document .json files (.jsonl output is always one compact record per line)")
     
     args = parser.parse_args()
     
-    discovery = FortiGateAPIDiscovery(args.fgt_ip, args.api_token, args.port, args.output)
+    discovery = FortiGateAPIDiscovery(args.fgt_ip, args.api_token, args.port, args.output, args.pretty)
     discovery.run_full_discovery()
 
 if __name__ == "__main__":
@@ -0,0 +1,337 @@
+import gzip
+import json
+import mmap
+import os
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Optional fast codecs; everything falls back to the standard library
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack", "application/vnd.msgpack")
+
+# Bodies smaller than this are sent uncompressed
+MIN_COMPRESS_SIZE = 1024
+
+
+def dumps_json(data: Any) -> bytes:
+    """Serialize data to compact JSON bytes (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False, default=str).encode()
+
+
+def loads_json(raw: bytes) -> Any:
+    """Deserialize JSON bytes produced by dumps_json."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def dumps_msgpack(data: Any) -> bytes:
+    """Serialize data to MessagePack bytes."""
+    if msgpack is None:
+        raise RuntimeError("msgpack is not installed")
+    return msgpack.packb(data, default=str)
+
+
+def loads_msgpack(raw: bytes) -> Any:
+    """Deserialize MessagePack bytes."""
+    if msgpack is None:
+        raise RuntimeError("msgpack is not installed")
+    return msgpack.unpackb(raw)
+
+
+def _parse_header(value: Optional[str]) -> List[Tuple[str, float]]:
+    """
+    Parse an Accept / Accept-Encoding header into (token, q) pairs.
+    :param value: Raw header value
+    :return: Tokens ordered by descending quality, refused (q=0) entries last
+    """
+    entries = []
+    for index, part in enumerate((value or "").split(",")):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, val = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = max(float(val), 0.0)
+                except ValueError:
+                    q = 0.0
+        entries.append((token, q, index))
+    entries.sort(key=lambda entry: (-entry[1], entry[2]))
+    return [(token, q) for token, q, _ in entries]
+
+
+def choose_media_type(accept: Optional[str]) -> str:
+    """
+    Pick the response media type for an Accept header.
+    :param accept: Accept header value
+    :return: MSGPACK_MEDIA_TYPE if preferred and available, else JSON_MEDIA_TYPE
+    """
+    for token, q in _parse_header(accept):
+        if q <= 0:
+            break
+        if token in MSGPACK_MEDIA_TYPES and msgpack is not None:
+            return MSGPACK_MEDIA_TYPE
+        if token in (JSON_MEDIA_TYPE, "application/*", "*/*"):
+            return JSON_MEDIA_TYPE
+    return JSON_MEDIA_TYPE
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Pick the content coding for an Accept-Encoding header.
+    :param accept_encoding: Accept-Encoding header value
+    :return: "zstd", "gzip" or None for identity
+    """
+    entries = _parse_header(accept_encoding)
+    # "*" only stands for codings the header does not name explicitly
+    listed = {token for token, _ in entries}
+    available = ["zstd", "gzip"] if zstandard is not None else ["gzip"]
+    for token, q in entries:
+        if q <= 0:
+            break
+        if token == "identity":
+            return None
+        if token in available:
+            return token
+        if token == "*":
+            for coding in available:
+                if coding not in listed:
+                    return coding
+    return None
+
+
+def compress(body: bytes, encoding: Optional[str]) -> bytes:
+    """Compress body with the given content coding."""
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=3).compress(body)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=5)
+    return body
+
+
+def decompress(body: bytes, encoding: Optional[str]) -> bytes:
+    """Reverse compress()."""
+    if encoding == "zstd":
+        return zstandard.ZstdDecompressor().decompress(body)
+    if encoding == "gzip":
+        return gzip.decompress(body)
+    return body
+
+
+def encode_response(data: Any, accept: Optional[str] = None,
+                    accept_encoding: Optional[str] = None) -> Tuple[bytes, str, Dict[str, str]]:
+    """
+    Encode a JSON-compatible payload according to the client's Accept headers.
+    :param data: Payload made of dicts, lists and scalars
+    :param accept: Accept header value
+    :param accept_encoding: Accept-Encoding header value
+    :return: (body, media_type, extra response headers)
+    """
+    media_type = choose_media_type(accept)
+    if media_type == MSGPACK_MEDIA_TYPE:
+        body = dumps_msgpack(data)
+    else:
+        body = dumps_json(data)
+
+    headers = {"Vary": "Accept, Accept-Encoding"}
+    encoding = choose_encoding(accept_encoding) if len(body) >= MIN_COMPRESS_SIZE else None
+    if encoding:
+        body = compress(body, encoding)
+        headers["Content-Encoding"] = encoding
+    return body, media_type, headers
+
+
+# --- Line-delimited snapshots ---
+
+def write_jsonl(path: str, records: Iterable[Any]) -> int:
+    """
+    Write records as line-delimited JSON (one compact record per line).
+    :param path: Output file path
+    :param records: Iterable of JSON-compatible records
+    :return: Number of records written
+    """
+    count = 0
+    with open(path, "wb") as f:
+        for record in records:
+            f.write(dumps_json(record))
+            f.write(b"\n")
+            count += 1
+    return count
+
+
+class JsonlSnapshot:
+    """
+    Read-only, memory-mapped view of a line-delimited JSON snapshot.
+    Records are decoded lazily so large snapshots never have to be loaded whole.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        if os.fstat(self._file.fileno()).st_size:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self._map = None
+        self._offsets = None
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _build_index(self) -> List[int]:
+        offsets = []
+        if self._map is not None:
+            pos, end = 0, len(self._map)
+            while pos < end:
+                line = self._line(pos)
+                if line.strip():
+                    offsets.append(pos)
+                pos += len(line) + 1
+        return offsets
+
+    def _line(self, start: int) -> bytes:
+        newline = self._map.find(b"\n", start)
+        return self._map[start:] if newline == -1 else self._map[start:newline]
+
+    def __len__(self) -> int:
+        if self._offsets is None:
+            self._offsets = self._build_index()
+        return len(self._offsets)
+
+    def __getitem__(self, index: int) -> Any:
+        if self._offsets is None:
+            self._offsets = self._build_index()
+        return loads_json(self._line(self._offsets[index]))
+
+    def __iter__(self) -> Iterator[Any]:
+        if self._map is None:
+            return
+        pos, end = 0, len(self._map)
+        while pos < end:
+            line = self._line(pos)
+            pos += len(line) + 1
+            if line.strip():
+                yield loads_json(line)
+
+    def query(self, **match) -> Iterator[Any]:
+        """
+        Yield records whose top-level fields equal the given values.
+        Values with a single JSON spelling (ASCII strings, ints, bools, None) are
+        matched against the raw line first, so most lines are skipped without decoding.
+        :param match: Field/value pairs, e.g. query(vlan=10, port="Gi0/1")
+        """
+        needles = [dumps_json(value) for value in match.values() if _is_canonical(value)]
+        if self._map is None:
+            return
+        pos, end = 0, len(self._map)
+        while pos < end:
+            line = self._line(pos)
+            pos += len(line) + 1
+            if not line.strip() or not all(needle in line for needle in needles):
+                continue
+            record = loads_json(line)
+            if isinstance(record, dict) and all(k in record and record[k] == v for k, v in match.items()):
+                yield record
+
+
+def _is_canonical(value: Any) -> bool:
+    """True if stdlib json, orjson and HTML-safe writers all spell value the same way."""
+    if value is None or isinstance(value, (bool, int)):
+        return True
+    if isinstance(value, str):
+        return value.isascii() and value.isprintable() and not any(c in value for c in '"\\/<>&\'')
+    return False
+
+
+# --- Benchmarks ---
+
+def _sample_mac_table(rows: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "switch": f"sw-{i // 48:04d}",
+            "port": f"port{i % 48 + 1}",
+            "vlan": 10 + i % 20,
+            "mac": f"00:1a:2b:{(i >> 16) & 0xff:02x}:{(i >> 8) & 0xff:02x}:{i & 0xff:02x}",
+            "in_errors": i % 7,
+            "out_errors": i % 3,
+            "status": "up" if i % 5 else "down",
+        }
+        for i in range(rows)
+    ]
+
+
+def benchmark(rows: int = 100000, repeat: int = 3) -> List[Dict[str, Any]]:
+    """
+    Compare size and encode/decode speed of the available formats.
+    :param rows: Number of synthetic MAC-table rows
+    :param repeat: Timing repetitions (best run is reported)
+    :return: One result dict per format
+    """
+    data = _sample_mac_table(rows)
+    codecs = [
+        ("json indent=2 (stdlib)", lambda d: json.dumps(d, indent=2).encode(), json.loads),
+        ("json compact (stdlib)",
+         lambda d: json.dumps(d, separators=(",", ":"), ensure_ascii=False).encode(), json.loads),
+    ]
+    if orjson is not None:
+        codecs.append(("json compact (orjson)", dumps_json, loads_json))
+    if msgpack is not None:
+        codecs.append(("msgpack", dumps_msgpack, loads_msgpack))
+    encodings = [None, "gzip"] + (["zstd"] if zstandard is not None else [])
+
+    def best(fn):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - start)
+        return min(timings) * 1000
+
+    results = []
+    for name, encode, decode in codecs:
+        raw = encode(data)
+        for encoding in encodings:
+            body = compress(raw, encoding)
+            results.append({
+                "format": name + (f" + {encoding}" if encoding else ""),
+                "bytes": len(body),
+                "encode_ms": round(best(lambda: compress(encode(data), encoding)), 1),
+                "decode_ms": round(best(lambda: decode(decompress(body, encoding))), 1),
+            })
+    return results
+
+
+# Example Usage
+if __name__ == "__main__":
+    for row in benchmark():
+        print(f"{row['format']:<36} {row['bytes']:>12,} B  "
+              f"encode {row['encode_ms']:>8} ms  decode {row['decode_ms']:>8} ms")
@@ -0,0 +1,113 @@
+import importlib.util
+import json
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("requests")
+
+SCRIPT = os.path.join(os.path.dirname(__file__), "network-mcp-servers", "fortigate-api-discovery.py")
+
+
+@pytest.fixture(scope="module")
+def discovery_module():
+    spec = importlib.util.spec_from_file_location("fortigate_api_discovery", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _discovery(module, tmp_path, pretty=False):
+    return module.FortiGateAPIDiscovery("192.0.2.1", "token", output_dir=str(tmp_path), pretty=pretty)
+
+
+def _read_jsonl(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_results_list_is_split_into_jsonl_and_meta(discovery_module, tmp_path):
+    discovery = _discovery(discovery_module, tmp_path)
+    discovery.save_results("cmdb_full_schema", {
+        "http_status": 200,
+        "serial": "FG100F",
+        "results": [{"name": "café"}, {"name": "interface"}],
+    })
+
+    assert sorted(os.listdir(tmp_path)) == ["cmdb_full_schema.jsonl", "cmdb_full_schema_meta.json"]
+    lines = (tmp_path / "cmdb_full_schema.jsonl").read_text(encoding="utf-8")
+    assert lines == '{"name":"café"}\n{"name":"interface"}\n'
+    meta = json.loads((tmp_path / "cmdb_full_schema_meta.json").read_text(encoding="utf-8"))
+    assert meta == {"http_status": 200, "serial": "FG100F"}
+
+
+def test_single_result_object_falls_back_to_json(discovery_module, tmp_path):
+    discovery = _discovery(discovery_module, tmp_path)
+    schema = {"http_status": 200, "results": {"name": "global", "children": {}}}
+    discovery.save_results("system_global_schema", schema)
+
+    assert os.listdir(tmp_path) == ["system_global_schema.json"]
+    raw = (tmp_path / "system_global_schema.json").read_text(encoding="utf-8")
+    assert "\n" not in raw
+    assert json.loads(raw) == schema
+
+
+def test_pretty_only_affects_json_documents(discovery_module, tmp_path):
+    discovery = _discovery(discovery_module, tmp_path, pretty=True)
+    discovery.save_results("monitor_directory", {"build": 1, "results": [{"path": "system"}, {"path": "wifi"}]})
+    discovery.save_results("wifi_schema", {"results": {"name": "wifi"}})
+
+    assert (tmp_path / "monitor_directory.jsonl").read_text() == '{"path":"system"}\n{"path":"wifi"}\n'
+    assert (tmp_path / "monitor_directory_meta.json").read_text() == '{\n  "build": 1\n}'
+    assert (tmp_path / "wifi_schema.json").read_text().startswith('{\n  "results": {\n')
+
+
+def test_pretty_flag_is_passed_from_command_line(discovery_module, tmp_path, monkeypatch):
+    created = []
+    monkeypatch.setattr(discovery_module.FortiGateAPIDiscovery, "run_full_discovery", lambda self: created.append(self))
+    monkeypatch.setattr(sys, "argv", ["fortigate-api-discovery.py", "192.0.2.1", "token", "-o", str(tmp_path), "--pretty"])
+    discovery_module.main()
+    assert created[0].pretty is True
+
+
+class FakeResponse:
+    def __init__(self, status_code, payload=None):
+        self.status_code = status_code
+        self._payload = payload
+
+    def json(self):
+        return self._payload
+
+
+def test_endpoint_tests_are_written_one_record_per_endpoint(discovery_module, tmp_path, monkeypatch):
+    def fake_get(url, **kwargs):
+        if "system/status" in url:
+            return FakeResponse(200, {"results": [{"a": 1}, {"a": 2}, {"a": 3}]})
+        if "dhcp/lease" in url:
+            raise ConnectionError("timed out")
+        return FakeResponse(404)
+
+    monkeypatch.setattr(discovery_module.requests, "get", fake_get)
+    discovery = _discovery(discovery_module, tmp_path)
+    results = discovery.test_network_endpoints()
+
+    records = _read_jsonl(tmp_path / "endpoint_tests.jsonl")
+    assert [record["endpoint"] for record in records] == list(results)
+    by_endpoint = {record.pop("endpoint"): record for record in records}
+    assert by_endpoint == results
+    assert by_endpoint["system/status"] == {
+        "status": "success",
+        "description": "System status",
+        "data_count": 3,
+        "sample_data": [{"a": 1}, {"a": 2}],
+    }
+    assert by_endpoint["system/interface"] == {
+        "status": "failed",
+        "description": "Interface information",
+        "error": "HTTP 404",
+    }
+    assert by_endpoint["system/dhcp/lease"] == {
+        "status": "error",
+        "description": "DHCP leases",
+        "error": "timed out",
+    }
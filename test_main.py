@@ -0,0 +1,86 @@
+import gzip
+import importlib
+import shutil
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+SNMP_REQUEST = {"ip": "192.0.2.1", "community": "public", "oid": "1.3.6.1.2.1.2.2.1.14"}
+
+
+@pytest.fixture(scope="module")
+def main_module():
+    # mcp_bridge resolves node at import time; the endpoints tested here never start it
+    with pytest.MonkeyPatch.context() as mp:
+        if shutil.which("node") is None:
+            mp.setattr(shutil, "which", lambda name: "/usr/bin/" + name)
+        return importlib.import_module("main")
+
+
+@pytest.fixture
+def client(main_module):
+    return TestClient(main_module.app)
+
+
+def _patch_snmp(monkeypatch, main_module, result):
+    monkeypatch.setattr(main_module, "fetch_snmp_counters", lambda ip, community, oid: result)
+
+
+def test_default_request_returns_same_json_body(client, main_module, monkeypatch):
+    _patch_snmp(monkeypatch, main_module, "42")
+    response = client.post("/api/snmp/check", json=SNMP_REQUEST, headers={"Accept-Encoding": "identity"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.headers["vary"] == "Accept, Accept-Encoding"
+    assert "content-encoding" not in response.headers
+    assert response.content == JSONResponse({"ip": "192.0.2.1", "result": "42"}).body
+
+
+def test_gzip_for_large_bodies(client, main_module, monkeypatch):
+    result = "ifInErrors " * 200
+    _patch_snmp(monkeypatch, main_module, result)
+    response = client.post("/api/snmp/check", json=SNMP_REQUEST, headers={"Accept-Encoding": "gzip"})
+
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert int(response.headers["content-length"]) < len(result)
+    # httpx transparently decodes the gzip body
+    assert response.json() == {"ip": "192.0.2.1", "result": result}
+
+
+def test_gzip_body_is_valid_gzip(client, main_module, monkeypatch):
+    result = "ifInErrors " * 200
+    _patch_snmp(monkeypatch, main_module, result)
+    with client.stream("POST", "/api/snmp/check", json=SNMP_REQUEST, headers={"Accept-Encoding": "gzip"}) as response:
+        raw = b"".join(response.iter_raw())
+    assert gzip.decompress(raw) == JSONResponse({"ip": "192.0.2.1", "result": result}).body
+
+
+def test_msgpack_response(client, main_module, monkeypatch):
+    msgpack = pytest.importorskip("msgpack")
+    _patch_snmp(monkeypatch, main_module, "42")
+    response = client.post("/api/snmp/check", json=SNMP_REQUEST, headers={"Accept": "application/msgpack"})
+
+    assert response.headers["content-type"] == "application/msgpack"
+    assert msgpack.unpackb(response.content) == {"ip": "192.0.2.1", "result": "42"}
+
+
+def test_errors_are_still_json(client, main_module, monkeypatch):
+    def fail(ip, community, oid):
+        raise RuntimeError("timeout")
+
+    monkeypatch.setattr(main_module, "fetch_snmp_counters", fail)
+    response = client.post("/api/snmp/check", json=SNMP_REQUEST, headers={"Accept": "application/msgpack"})
+    assert response.status_code == 500
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == {"detail": "timeout"}
+
+    response = client.get("/api/mcp/unknown/tools")
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Server not found"}
@@ -0,0 +1,204 @@
+import gzip
+
+import pytest
+
+import result_codec
+from result_codec import (
+    JSON_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPE,
+    JsonlSnapshot,
+    _parse_header,
+    choose_encoding,
+    choose_media_type,
+    decompress,
+    dumps_json,
+    encode_response,
+    loads_json,
+    write_jsonl,
+)
+
+
+@pytest.fixture
+def no_optional_codecs(monkeypatch):
+    monkeypatch.setattr(result_codec, "msgpack", None)
+    monkeypatch.setattr(result_codec, "zstandard", None)
+
+
+@pytest.fixture
+def with_optional_codecs(monkeypatch):
+    # Availability checks only test for None; round-trips use the real modules below
+    monkeypatch.setattr(result_codec, "msgpack", object())
+    monkeypatch.setattr(result_codec, "zstandard", object())
+
+
+# --- Header parsing ---
+
+def test_parse_header_orders_by_quality_then_position():
+    assert _parse_header("a;q=0.5, b, c;q=0.8, d") == [("b", 1.0), ("d", 1.0), ("c", 0.8), ("a", 0.5)]
+
+
+def test_parse_header_keeps_refusals_last():
+    assert _parse_header("gzip;q=0, br;q=0.1") == [("br", 0.1), ("gzip", 0.0)]
+
+
+def test_parse_header_q_is_case_insensitive_and_invalid_q_refuses():
+    assert _parse_header("GZIP;Q=0, br;q=oops, zstd") == [("zstd", 1.0), ("gzip", 0.0), ("br", 0.0)]
+
+
+def test_parse_header_empty():
+    assert _parse_header(None) == []
+    assert _parse_header(" , ") == []
+
+
+# --- Media type ---
+
+def test_media_type_defaults_to_json(no_optional_codecs):
+    assert choose_media_type(None) == JSON_MEDIA_TYPE
+    assert choose_media_type("text/html") == JSON_MEDIA_TYPE
+
+
+def test_media_type_msgpack_requires_module(no_optional_codecs):
+    assert choose_media_type("application/msgpack") == JSON_MEDIA_TYPE
+
+
+def test_media_type_msgpack_when_available(with_optional_codecs):
+    assert choose_media_type("application/x-msgpack") == MSGPACK_MEDIA_TYPE
+    assert choose_media_type("application/json;q=0.5, application/msgpack") == MSGPACK_MEDIA_TYPE
+    assert choose_media_type("application/msgpack;q=0.5, application/json") == JSON_MEDIA_TYPE
+    assert choose_media_type("application/msgpack;q=0, */*") == JSON_MEDIA_TYPE
+
+
+# --- Content coding ---
+
+@pytest.mark.parametrize("header, expected", [
+    (None, None),
+    ("gzip", "gzip"),
+    ("zstd", None),
+    ("zstd, gzip", "gzip"),
+    ("*", "gzip"),
+    ("gzip;q=0, *", None),
+    ("identity, gzip;q=0.1", None),
+    ("gzip;Q=0", None),
+])
+def test_encoding_without_zstandard(no_optional_codecs, header, expected):
+    assert choose_encoding(header) == expected
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("zstd", "zstd"),
+    ("gzip, zstd", "gzip"),
+    ("gzip;q=0.5, zstd", "zstd"),
+    ("*", "zstd"),
+    ("zstd;q=0, *", "gzip"),
+    ("zstd;q=0, gzip;q=0, *", None),
+    ("*, zstd;q=0.1", "gzip"),
+    ("*;q=0.5, zstd;q=0.1", "gzip"),
+    ("gzip;q=0.1, *", "zstd"),
+])
+def test_encoding_with_zstandard(with_optional_codecs, header, expected):
+    assert choose_encoding(header) == expected
+
+
+# --- Round trips ---
+
+PAYLOAD = {"ip": "10.0.0.1", "result": [{"port": f"port{i}", "vlan": i % 20} for i in range(200)]}
+
+
+def test_roundtrip_json_uncompressed(no_optional_codecs):
+    body, media_type, headers = encode_response(PAYLOAD, "application/json", None)
+    assert media_type == JSON_MEDIA_TYPE
+    assert "Content-Encoding" not in headers
+    assert loads_json(body) == PAYLOAD
+
+
+def test_roundtrip_json_gzip(no_optional_codecs):
+    body, media_type, headers = encode_response(PAYLOAD, None, "gzip")
+    assert headers["Content-Encoding"] == "gzip"
+    assert headers["Vary"] == "Accept, Accept-Encoding"
+    assert loads_json(decompress(body, "gzip")) == PAYLOAD
+    assert gzip.decompress(body) == dumps_json(PAYLOAD)
+
+
+def test_small_bodies_are_not_compressed():
+    body, _, headers = encode_response({"status": "ok"}, None, "gzip")
+    assert "Content-Encoding" not in headers
+    assert loads_json(body) == {"status": "ok"}
+
+
+def test_non_string_keys():
+    body, _, _ = encode_response({1: "a"}, "application/json")
+    assert loads_json(body) == {"1": "a"}
+
+
+def test_roundtrip_msgpack():
+    pytest.importorskip("msgpack")
+    body, media_type, _ = encode_response(PAYLOAD, "application/msgpack", None)
+    assert media_type == MSGPACK_MEDIA_TYPE
+    assert result_codec.loads_msgpack(body) == PAYLOAD
+
+
+def test_roundtrip_zstd():
+    pytest.importorskip("zstandard")
+    body, _, headers = encode_response(PAYLOAD, None, "zstd")
+    assert headers["Content-Encoding"] == "zstd"
+    assert loads_json(decompress(body, "zstd")) == PAYLOAD
+
+
+# --- JsonlSnapshot ---
+
+def _snapshot(tmp_path, raw: bytes) -> JsonlSnapshot:
+    path = tmp_path / "snapshot.jsonl"
+    path.write_bytes(raw)
+    return JsonlSnapshot(str(path))
+
+
+def test_snapshot_empty_file(tmp_path):
+    with _snapshot(tmp_path, b"") as snapshot:
+        assert len(snapshot) == 0
+        assert list(snapshot) == []
+        assert list(snapshot.query(x=1)) == []
+        with pytest.raises(IndexError):
+            snapshot[0]
+
+
+@pytest.mark.parametrize("raw", [
+    b'{"x":1}\n{"x":2}\n',
+    b'{"x":1}\n{"x":2}',
+    b'{"x":1}\n\n  \n{"x":2}\n\n',
+])
+def test_snapshot_newlines_and_blank_lines(tmp_path, raw):
+    with _snapshot(tmp_path, raw) as snapshot:
+        assert len(snapshot) == 2
+        assert list(snapshot) == [{"x": 1}, {"x": 2}]
+        assert snapshot[1] == {"x": 2}
+        assert snapshot[-1] == {"x": 2}
+
+
+def test_write_jsonl_roundtrip(tmp_path):
+    records = [{"port": "port1", "vlan": 10}, {"port": "port2", "vlan": 20}]
+    path = tmp_path / "macs.jsonl"
+    assert write_jsonl(str(path), records) == 2
+    with JsonlSnapshot(str(path)) as snapshot:
+        assert list(snapshot) == records
+        assert list(snapshot.query(vlan=20)) == [records[1]]
+        assert list(snapshot.query(port="port1", vlan=20)) == []
+
+
+def test_query_matches_values_spelled_differently_on_disk(tmp_path):
+    raw = b'{"name":"caf\\u00e9","x":1,"path":"a\\/b"}\n{"name":"other","x":2,"path":"c"}\n'
+    with _snapshot(tmp_path, raw) as snapshot:
+        first = {"name": "café", "x": 1, "path": "a/b"}
+        assert list(snapshot.query(name="café")) == [first]
+        assert list(snapshot.query(x=1.0)) == [first]
+        assert list(snapshot.query(path="a/b")) == [first]
+
+
+def test_query_matches_html_escaped_values(tmp_path):
+    raw = b'{"name":"\\u003cR\\u0026D\\u003e \\u0027lab\\u0027"}\n'
+    with _snapshot(tmp_path, raw) as snapshot:
+        assert list(snapshot.query(name="<R&D> 'lab'")) == [{"name": "<R&D> 'lab'"}]
+
+
+def test_query_requires_field_presence(tmp_path):
+    with _snapshot(tmp_path, b'{"x":null}\n{"y":1}\n') as snapshot:
+        assert list(snapshot.query(x=None)) == [{"x": None}]